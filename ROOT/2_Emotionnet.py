@@ -1,61 +1,735 @@
 # ROOT/2_EmotionNet.py — v4 Hybrid GNN-Symbolic Lattice (March 2026)
 # Mash: Plutchik wheel + VAD dims + OCC appraisal + temporal LSTM + spring tension
-# Neural upgrades: Torch MLP for blends, LSTM for sequences, custom attn for GNN-like propagation
+# Neural upgrades: MLP for blends, LSTM for sequences, custom attn for GNN-like propagation
+# (NumPy inference by default; Torch only with backend='torch')
 
+import contextlib
+import copy
+import heapq
+import itertools
 import random
+import threading
 import warnings
-import networkx as nx
+from time import perf_counter
+from types import SimpleNamespace
 import numpy as np
-from scipy.spatial.distance import cosine  # Switch to cosine for better sim
-import torch
-import torch.nn as nn
-import torch.nn.functional as F
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import laplacian
+from scipy.sparse.linalg import lobpcg
 
 warnings.filterwarnings("ignore", category=RuntimeWarning)
 
-class SimpleGATLayer(nn.Module):  # Custom GAT sim without torch_geometric
-    def __init__(self, in_dim, out_dim):
-        super().__init__()
-        self.fc = nn.Linear(in_dim * 2, out_dim)
-        self.attn = nn.Linear(out_dim, 1)
-
-    def forward(self, node_feats, adj):
-        # Basic self-attn propagation
-        h = torch.cat([node_feats.unsqueeze(1).repeat(1, adj.size(1), 1), 
-                       node_feats[adj.long()]], dim=-1)
-        h = F.leaky_relu(self.fc(h.view(-1, h.size(-1))))
-        attn_scores = self.attn(h).view(adj.size())
-        attn_scores = F.softmax(attn_scores.masked_fill(~adj.bool(), float('-inf')), dim=1)
-        return torch.matmul(attn_scores, node_feats)
+EDGE_TYPES = ('opposite', 'family_spring', 'cluster_spring', 'blend_spring')
+EDGE_CODES = {t: i for i, t in enumerate(EDGE_TYPES)}
+# Per-type gain on the val spread (springs > 0 pull neighbours together, opposites < 0 push
+# apart). All zero by default, i.e. plain decay; opt in per lattice with set_edge_gain().
+EDGE_GAINS = {'opposite': 0.0, 'family_spring': 0.0, 'cluster_spring': 0.0, 'blend_spring': 0.0}
+SNAPSHOT_VERSION = 1
+NET_MODULES = ('blend_mlp', 'temporal_lstm', 'gat_layer')
+HIST_TURNS, HIST_WIDTH = 10, 5  # History ring: turns kept, matched nodes tracked per turn
+_COW_ARRAYS = ('vecs', 'vals', 'inactive', 'fam_codes', 'alive', 'unit', 'e_src', 'e_dst', 'e_w', 'e_type', 'wdeg',
+               'push_field', 'push_res')
+_SEED_TEMPLATES = {}  # Seed template per EmotionNet config, built on first use
+EVENT_WORDS = ('event', 'agent', 'object', 'cause', 'relief')  # OCC appraisal cues
+EVENT_SPAN = max(map(len, EVENT_WORDS))
+CHAR_MAP = {
+    "tsundere": ["anger", "tenderness", "longing", "defiance"],
+    "yandere": ["obsession", "lust", "rage", "love"],
+    "gentle": ["compassion", "warmth", "serenity", "trust"],
+    "chaotic": ["defiance", "ecstasy", "rage", "surprise"],
+    "brooding": ["melancholy", "yearning", "ache", "resentment"],
+    "sunshine": ["joy", "delight", "wonder", "anticipation"],
+}
+
+_TORCH = None
+
+
+def _torch():
+    # Torch is imported on first use only (backend='torch'); numpy workers never pay for it
+    global _TORCH
+    if _TORCH is not None:
+        return _TORCH
+    import torch
+    import torch.nn as nn
+    import torch.nn.functional as F
+
+    class SimpleGATLayer(nn.Module):  # Custom GAT sim without torch_geometric
+        def __init__(self, in_dim, out_dim):
+            super().__init__()
+            self.fc = nn.Linear(in_dim * 2, out_dim)
+            self.attn = nn.Linear(out_dim, 1)
+
+        def forward(self, node_feats, adj):
+            # Dense reference path: pair [x_i, x_j] for every (i, j), mask non-edges
+            n = node_feats.size(0)
+            h = torch.cat([node_feats.unsqueeze(1).expand(n, n, -1),
+                           node_feats.unsqueeze(0).expand(n, n, -1)], dim=-1)
+            h = F.leaky_relu(self.fc(h.reshape(-1, h.size(-1))))
+            attn_scores = self.attn(h).view(n, n)
+            attn_scores = F.softmax(attn_scores.masked_fill(~adj.bool(), float('-inf')), dim=1)
+            out = torch.matmul(attn_scores.nan_to_num(0.0), node_feats)
+            return torch.where(adj.bool().any(dim=1, keepdim=True), out, node_feats)  # Isolated nodes hold
+
+        def forward_sparse(self, node_feats, src, dst):
+            # Edge-list path: message src -> dst, softmax per destination segment. Same
+            # output as forward() for adj[dst, src] = 1; dst, src = adj.nonzero(as_tuple=True)
+            n = node_feats.size(0)
+            h = F.leaky_relu(self.fc(torch.cat([node_feats[dst], node_feats[src]], dim=-1)))
+            scores = self.attn(h).squeeze(-1)
+            seg_max = torch.full((n,), float('-inf'), dtype=scores.dtype, device=scores.device)
+            seg_max = seg_max.scatter_reduce(0, dst, scores, reduce='amax')
+            w = torch.exp(scores - seg_max[dst])
+            denom = torch.zeros(n, dtype=w.dtype, device=w.device).index_add_(0, dst, w)
+            alpha = w / denom[dst]
+            out = torch.zeros_like(node_feats).index_add_(0, dst, alpha.unsqueeze(-1) * node_feats[src])
+            has_in = torch.zeros(n, dtype=torch.bool, device=dst.device)
+            has_in[dst] = True
+            return torch.where(has_in.unsqueeze(-1), out, node_feats)
+
+    _TORCH = SimpleNamespace(torch=torch, nn=nn, F=F, SimpleGATLayer=SimpleGATLayer)
+    return _TORCH
+
+
+def __getattr__(name):
+    if name == 'SimpleGATLayer':  # Kept importable from here; pulls torch in on access
+        return _torch().SimpleGATLayer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class TorchNets:
+    # Blend MLP (3d -> 2d -> d), temporal LSTM and GAT layer as torch modules
+    def __init__(self, dim, device='cpu'):
+        t = _torch()
+        self.torch = t.torch
+        self.device = t.torch.device(device)
+        self.dim = dim
+        nn = t.nn
+        self.blend_mlp = nn.Sequential(
+            nn.Linear(dim * 3, dim * 2),  # For avg/min/max vec concat
+            nn.ReLU(),
+            nn.Linear(dim * 2, dim),
+            nn.Tanh()  # Normalize-ish
+        ).to(self.device)
+        self.temporal_lstm = nn.LSTM(dim, dim, batch_first=True).to(self.device)
+        self.gat_layer = t.SimpleGATLayer(dim, dim).to(self.device)
+        self.frozen = False
+        self.jit = False
+        self._bind()
+
+    def _bind(self):
+        self._blend_fn = self.blend_mlp
+        self._lstm_fn = self.temporal_lstm
+        self._gat_fn = self.gat_layer.forward_sparse
+
+    def freeze(self, jit=False):
+        # Serving mode: eval + no param grads, every forward under inference_mode (no autograd
+        # bookkeeping). jit=True also traces the three forwards once; traces are size-generic.
+        torch = self.torch
+        for module in NET_MODULES:
+            getattr(self, module).eval().requires_grad_(False)
+        self.frozen = True
+        self.jit = jit
+        self._bind()
+        if jit:
+            dim, dev = self.dim, self.device
+            feats = torch.randn(5, dim, device=dev)
+            src = torch.tensor([0, 1, 1, 2, 3, 4], device=dev)
+            dst = torch.tensor([1, 0, 2, 1, 4, 3], device=dev)
+            with torch.no_grad(), warnings.catch_warnings():
+                warnings.simplefilter("ignore", FutureWarning)  # jit.trace deprecation notice
+                self._blend_fn = torch.jit.trace(self.blend_mlp, torch.randn(2, dim * 3, device=dev))
+                self._lstm_fn = torch.jit.trace(self.temporal_lstm, (torch.randn(2, 1, dim, device=dev),
+                                                                     (torch.zeros(1, 2, dim, device=dev),
+                                                                      torch.zeros(1, 2, dim, device=dev))))
+                self._gat_fn = torch.jit.trace_module(self.gat_layer, {'forward_sparse': (feats, src, dst)}).forward_sparse
+
+    def _mode(self):
+        return self.torch.inference_mode() if self.frozen else self.torch.enable_grad()
+
+    def _to_torch(self, arr):
+        return self.torch.from_numpy(arr).to(self.device)  # Shares memory on CPU
+
+    def _to_numpy(self, t):
+        return t.numpy() if self.frozen and t.device.type == 'cpu' else t.detach().cpu().numpy()
+
+    def blend(self, concat):
+        # (B, 3*dim) -> (B, dim)
+        with self._mode():
+            return self._to_numpy(self._blend_fn(self._to_torch(concat)))
+
+    def lstm_step(self, x, h, c):
+        # One step for B streams: (B, dim) input + carried (h, c) -> new (h, c)
+        with self._mode():
+            state = (self._to_torch(h).unsqueeze(0), self._to_torch(c).unsqueeze(0))
+            _, (h, c) = self._lstm_fn(self._to_torch(x).unsqueeze(1), state)
+            return self._to_numpy(h[0]), self._to_numpy(c[0])
+
+    def gat(self, feats, src, dst):
+        torch = self.torch
+        with torch.inference_mode() if self.frozen else torch.no_grad():
+            out = self._gat_fn(self._to_torch(feats), self._to_torch(src), self._to_torch(dst))
+            return self._to_numpy(out)
+
+    def export_weights(self):
+        return {f'{module}:{key}': tensor.detach().cpu().numpy()
+                for module in NET_MODULES for key, tensor in getattr(self, module).state_dict().items()}
+
+    def load_weights(self, weights):
+        for module in NET_MODULES:
+            prefix = f'{module}:'
+            state = {k[len(prefix):]: self.torch.from_numpy(np.asarray(v)) for k, v in weights.items()
+                     if k.startswith(prefix)}
+            getattr(self, module).load_state_dict(state)
+        if self.jit:
+            self.freeze(jit=True)  # Retrace against the new weights
+
+
+class NumpyNets:
+    # Same three networks in plain NumPy for inference: same weight keys as TorchNets,
+    # default init matches torch's (uniform +-1/sqrt(fan_in), LSTM +-1/sqrt(hidden))
+    def __init__(self, dim):
+        def uniform(fan_in, *shape):
+            bound = 1.0 / np.sqrt(fan_in)
+            return np.random.uniform(-bound, bound, shape).astype(np.float32)
+
+        self.dim = dim
+        self.w = {
+            'blend_mlp:0.weight': uniform(dim * 3, dim * 2, dim * 3),
+            'blend_mlp:0.bias': uniform(dim * 3, dim * 2),
+            'blend_mlp:2.weight': uniform(dim * 2, dim, dim * 2),
+            'blend_mlp:2.bias': uniform(dim * 2, dim),
+            'temporal_lstm:weight_ih_l0': uniform(dim, 4 * dim, dim),
+            'temporal_lstm:weight_hh_l0': uniform(dim, 4 * dim, dim),
+            'temporal_lstm:bias_ih_l0': uniform(dim, 4 * dim),
+            'temporal_lstm:bias_hh_l0': uniform(dim, 4 * dim),
+            'gat_layer:fc.weight': uniform(dim * 2, dim, dim * 2),
+            'gat_layer:fc.bias': uniform(dim * 2, dim),
+            'gat_layer:attn.weight': uniform(dim, 1, dim),
+            'gat_layer:attn.bias': uniform(dim, 1),
+        }
+
+    def blend(self, concat):
+        w = self.w
+        h = np.maximum(concat @ w['blend_mlp:0.weight'].T + w['blend_mlp:0.bias'], 0.0)
+        return np.tanh(h @ w['blend_mlp:2.weight'].T + w['blend_mlp:2.bias'])
+
+    def lstm_step(self, x, h, c):
+        w = self.w
+        gates = (x @ w['temporal_lstm:weight_ih_l0'].T + w['temporal_lstm:bias_ih_l0']
+                 + h @ w['temporal_lstm:weight_hh_l0'].T + w['temporal_lstm:bias_hh_l0'])
+        i, f, g, o = np.split(gates, 4, axis=1)  # Torch gate order
+        c = _sigmoid(f) * c + _sigmoid(i) * np.tanh(g)
+        h = _sigmoid(o) * np.tanh(c)
+        return h.astype(np.float32), c.astype(np.float32)
+
+    def gat(self, feats, src, dst):
+        w = self.w
+        n = len(feats)
+        h = np.concatenate([feats[dst], feats[src]], axis=1) @ w['gat_layer:fc.weight'].T + w['gat_layer:fc.bias']
+        h = np.where(h > 0, h, 0.01 * h)  # leaky_relu
+        scores = h @ w['gat_layer:attn.weight'][0] + w['gat_layer:attn.bias'][0]
+        seg_max = np.full(n, -np.inf, dtype=np.float32)
+        np.maximum.at(seg_max, dst, scores)
+        e = np.exp(scores - seg_max[dst])
+        alpha = (e / np.bincount(dst, weights=e, minlength=n)[dst]).astype(np.float32)
+        out = np.zeros_like(feats)
+        np.add.at(out, dst, alpha[:, None] * feats[src])
+        has_in = np.bincount(dst, minlength=n) > 0
+        return np.where(has_in[:, None], out, feats)
+
+    def freeze(self, jit=False):
+        pass  # Already inference-only
+
+    def export_weights(self):
+        return {k: v.copy() for k, v in self.w.items()}
+
+    def load_weights(self, weights):
+        for k in self.w:
+            self.w[k] = np.asarray(weights[k], dtype=np.float32).reshape(self.w[k].shape)
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _has_event(text_lower):
+    return any(word in text_lower for word in EVENT_WORDS)
+
+
+def _storage_dtype(precision):
+    if precision == 'bfloat16':  # Not a numpy type; optional ml_dtypes provides it
+        try:
+            import ml_dtypes
+        except ImportError:
+            raise ImportError("precision='bfloat16' needs the ml_dtypes package") from None
+        return np.dtype(ml_dtypes.bfloat16)
+    if precision not in ('float16', 'float32', 'float64'):
+        raise ValueError(f"unknown precision {precision!r}")
+    return np.dtype(precision)
+
+
+def _to_npz(arr):
+    # npz only round-trips numpy's own dtypes: bfloat16 goes in as its raw uint16 bits
+    return arr.view(np.uint16) if arr.dtype.kind == 'V' else arr
+
+
+def _from_npz(arr, dtype):
+    return arr.view(dtype) if arr.dtype == np.uint16 and dtype.kind == 'V' else arr
+
+
+def make_nets(backend, dim):
+    if backend == 'numpy':
+        return NumpyNets(dim)
+    if backend == 'torch':
+        return TorchNets(dim)
+    raise ValueError(f"unknown backend {backend!r} (expected 'numpy' or 'torch')")
+
+
+class KeywordAutomaton:
+    # Aho-Corasick over node-name parts: a node matches when any dash-separated part of its
+    # name occurs in the text, so one pass over the text finds every matching node.
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.term = [None]  # state -> pattern ending here
+        self.out = [-1]  # state -> next terminal state down the fail chain
+        self.owners = {}  # pattern -> set of node names using it
+        self.always = set()  # Nodes with an empty part ('' is in every text)
+        self._dirty = False
+        self._dead = 0
+        self.generation = 0  # Bumped when states are renumbered; saved scan states die with it
+
+    def add(self, node):
+        for part in set(node.split('-')):
+            if not part:
+                self.always.add(node)
+                continue
+            owners = self.owners.get(part)
+            if owners is None:
+                owners = self.owners[part] = set()
+                self._insert(part)
+            elif not owners:
+                self._dead -= 1
+            owners.add(node)
+
+    def remove(self, node):
+        self.always.discard(node)
+        for part in set(node.split('-')):
+            owners = self.owners.get(part)
+            if owners and node in owners:
+                owners.discard(node)
+                if not owners:
+                    self._dead += 1  # Trie keeps the path; compacted once dead dominate
+        if self._dead > 64 and self._dead > len(self.owners) // 2:
+            self._compact()
+
+    def _insert(self, part):
+        state = 0
+        for ch in part:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.term.append(None)
+                self.out.append(-1)
+                self.goto[state][ch] = nxt
+            state = nxt
+        self.term[state] = part
+        self._dirty = True
+
+    def _compact(self):
+        live = {p: o for p, o in self.owners.items() if o}
+        generation, always = self.generation, self.always
+        self.__init__()
+        self.generation = generation + 1
+        self.always = always
+        for part, owners in live.items():
+            self.owners[part] = owners
+            self._insert(part)
+
+    def _build(self):
+        # BFS failure links + output links over the whole trie; only after new patterns
+        queue = list(self.goto[0].values())
+        for child in queue:
+            self.fail[child] = 0
+            self.out[child] = -1
+        for state in queue:
+            for ch, child in self.goto[state].items():
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                f = self.goto[f].get(ch, 0)
+                self.fail[child] = f
+                self.out[child] = f if self.term[f] is not None else self.out[f]
+                queue.append(child)
+        self._dirty = False
+
+    def find_parts(self, text, state=0):
+        # Returns (patterns seen, end state); pass the state back in to resume across chunks
+        if self._dirty:
+            self._build()
+        goto, fail, term, out = self.goto, self.fail, self.term, self.out
+        hit_states = set()
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if state:
+                hit_states.add(state)
+        parts = set()
+        seen = set()
+        for t in hit_states:
+            if term[t] is None:
+                t = out[t]
+            while t != -1 and t not in seen:
+                seen.add(t)
+                parts.add(term[t])
+                t = out[t]
+        return parts, state
+
+    def match(self, text):
+        nodes = set(self.always)
+        for part in self.find_parts(text)[0]:
+            nodes |= self.owners[part]
+        return nodes
+
+
+class StageProfiler:
+    # Opt-in per-turn instrumentation: exclusive wall time per pipeline stage (prune is
+    # carved out of whichever stage triggered it), node counters, and a rolling window
+    # of the last `window` samples per stage for percentiles / a log-bucket histogram
+    STAGES = ('match', 'fracture', 'blend', 'lstm', 'propagate', 'prune')
+    BUCKETS = np.logspace(-6, 0, 13)  # 1us .. 1s, half-decade edges
+
+    def __init__(self, window=256):
+        self.window = window
+        self.samples = {stage: np.zeros(window) for stage in self.STAGES}
+        self.calls = dict.fromkeys(self.STAGES, 0)
+        self.total = dict.fromkeys(self.STAGES, 0.0)
+        self.counts = {'turns': 0, 'matched': 0, 'added': 0, 'pruned': 0}
+        self._t = 0.0
+        self._nested = 0.0
+
+    def start(self):
+        self.counts['turns'] += 1
+        self._t = perf_counter()
+        self._nested = 0.0
+
+    def lap(self, stage):
+        now = perf_counter()
+        self.record(stage, now - self._t - self._nested)
+        self._t = now
+        self._nested = 0.0
+
+    def nested(self, stage, t0):
+        dt = perf_counter() - t0
+        self.record(stage, dt)
+        self._nested += dt
+
+    def record(self, stage, dt):
+        self.samples[stage][self.calls[stage] % self.window] = dt
+        self.calls[stage] += 1
+        self.total[stage] += dt
+
+    def stats(self):
+        stages = {}
+        for stage in self.STAGES:
+            n = self.calls[stage]
+            recent = self.samples[stage][:min(n, self.window)]
+            if not n:
+                stages[stage] = {'calls': 0, 'total': 0.0}
+                continue
+            p50, p95 = np.percentile(recent, [50, 95])
+            stages[stage] = {
+                'calls': n, 'total': self.total[stage], 'mean': self.total[stage] / n,
+                'p50': float(p50), 'p95': float(p95), 'max': float(recent.max()),
+                # hist[i] = recent samples in [BUCKETS[i-1], BUCKETS[i]); last = overflow
+                'hist': np.bincount(np.searchsorted(self.BUCKETS, recent, side='right'),
+                                    minlength=len(self.BUCKETS) + 1).tolist(),
+            }
+        return {'stages': stages, 'buckets': self.BUCKETS.tolist(), **self.counts}
+
 
 class EmotionNet:
-    def __init__(self, dim=4, max_nodes=512, damping=0.85, co_act_thresh=0.45, inactive_max=12):
-        self.G = nx.Graph()
-        self.vectors = {}
-        self.vals = {}
+    def __init__(self, dim=4, max_nodes=512, damping=0.85, co_act_thresh=0.45, inactive_max=12, seed=True,
+                 backend='numpy', precision='float32'):
         self.opposites = {}
-        self.families = {}
         self.turn = 0
         self.dim = dim
         self.max_nodes = max_nodes
         self.damping = damping
         self.co_act_thresh = co_act_thresh
         self.inactive_max = inactive_max
-        self.history = []  # Temporal sequences: list of prev state dicts
-        self.device = torch.device('cpu')  # Or 'cuda' if avail
+        # Storage precision for per-node vecs/vals; kernels compute in at least float32
+        self.precision = precision
+        self.dtype = _storage_dtype(precision)
+        self.compute_dtype = np.promote_types(self.dtype, np.float32)
+        self._shared = False  # True while lattice state is borrowed from a seed template
+        self._template = False  # True on a cached seed template: read-only, never used as a session
+        self._init_session()
 
-        # Neural components
-        self.blend_mlp = nn.Sequential(
-            nn.Linear(dim * 3, dim * 2),  # For avg/min/max vec concat
-            nn.ReLU(),
-            nn.Linear(dim * 2, dim),
-            nn.Tanh()  # Normalize-ish
-        ).to(self.device)
-        self.temporal_lstm = nn.LSTM(dim, dim, batch_first=True).to(self.device)
-        self.gat_layer = SimpleGATLayer(dim, dim).to(self.device)
+        # Array-backed lattice store: name -> slot, one row per slot, freed slots reused
+        self.index = {}
+        self.names = []  # slot -> name (None when free)
+        self.free_slots = []
+        self.vecs = np.zeros((max_nodes, dim), dtype=self.dtype)
+        self.vals = np.zeros(max_nodes, dtype=self.dtype)
+        self.inactive = np.zeros(max_nodes, dtype=np.int32)
+        self.fam_codes = np.full(max_nodes, -1, dtype=np.int16)
+        self.alive = np.zeros(max_nodes, dtype=bool)
+        self.unit = np.zeros((max_nodes, dim), dtype=self.dtype)  # Row-normalized vecs for cosine queries
+        self._unit_stale = False
+        self.family_codes = {}  # family name -> code
+        self.family_names = []  # code -> family name
+        self.fam_count = []  # code -> live nodes in family, kept incrementally
+        self._evict_heap = []  # Lazy min-heap of (prune key, slot); entry valid while key is current
+        self._heap_stale = True  # Bulk val updates invalidate every entry at once
+        # Push propagation state: push_field = spread(vals - push_res), kept incrementally; push_res
+        # holds val changes not yet pushed to neighbours. Bulk val writes make the field stale.
+        self.push_eps = None  # Set (e.g. 5e-3) to make propagate_tension push instead of full steps
+        self.relax_iters = None  # Set (e.g. 20) to make propagate_tension relax(); push_eps wins if both are set
+        self.push_field = np.zeros(max_nodes, dtype=np.float64)
+        self.push_res = np.zeros(max_nodes, dtype=np.float64)
+        self._field_stale = True
+        self._field_dirty = set()  # Slots whose incident edges changed since the last push
+        self._vec_moved = np.zeros(0, dtype=np.int64)  # Slots whose vec the last push GAT moved by > eps
+
+        # Live edge store: compact parallel arrays (swap-remove on delete), updated in place
+        self.n_edges = 0
+        self.e_src = np.zeros(256, dtype=np.int64)
+        self.e_dst = np.zeros(256, dtype=np.int64)
+        self.e_w = np.zeros(256, dtype=np.float32)
+        self.e_type = np.zeros(256, dtype=np.int8)
+        self.wdeg = np.zeros(max_nodes, dtype=np.float64)  # slot -> sum of |w| over incident edges
+        self.edge_gains = np.array([EDGE_GAINS[t] for t in EDGE_TYPES], dtype=np.float32)  # By type code
+        self.edge_ids = {}  # (lo slot, hi slot) -> edge id
+        self.incident = {}  # slot -> set of edge ids
+        self.matcher = KeywordAutomaton()  # Kept in step with node add/prune
+        self.char_slots = {ctype: set() for ctype in CHAR_MAP}  # Archetype -> candidate slots
+        self.graph_version = 0  # Bumped on any node/edge structure change
+        self._spectral = None  # Cached extreme eigenpairs, keyed on graph_version
+
+        # Neural components: blend MLP, temporal LSTM, GAT layer behind one backend
+        self.backend = backend
+        self.nets = make_nets(backend, dim)
+
+        if seed:  # load_snapshot skips this and restores state instead
+            self.seed_emergence_block()
+            self._spectral_init()
+
+    def _init_session(self):
+        # Per-conversation state; never shared with a seed template
+        self.prof = None  # StageProfiler when enabled via profile(); None costs one check per stage
+        # Temporal sequences: fixed ring of the last HIST_TURNS turns, up to HIST_WIDTH matched
+        # slots each (-1 = empty), plus per-slot occurrence counts kept in step
+        self.hist_slots = np.full((HIST_TURNS, HIST_WIDTH), -1, dtype=np.int64)
+        self.hist_steps = 0  # Total turns pushed; ring row = steps % HIST_TURNS
+        self.hist_count = np.zeros(self.max_nodes, dtype=np.int32)
+        # Streaming temporal state: LSTM (h, c) carried across turns, one step per turn
+        self.lstm_h = np.zeros(self.dim, dtype=np.float32)
+        self.lstm_c = np.zeros(self.dim, dtype=np.float32)
+        # Optional background ticker: ingestion marks the lattice dirty, the ticker propagates.
+        # The lock serializes ingestion, ticks and reads, so routing never sees a half step.
+        self._lock = threading.RLock()
+        self._dirty = threading.Event()
+        self._ticker = None  # (thread, stop event) while running
+        self._stream = None  # In-flight feed() message state, None between messages
+
+    # Copy-on-write seed template: one seeded lattice per config, frozen and shared by every
+    # session made from it. A session borrows the template's arrays and tables until its
+    # first mutation, so creating one is O(1) and an idle session costs only its own state.
+    @classmethod
+    def seed_template(cls, dim=4, max_nodes=512, damping=0.85, co_act_thresh=0.45, inactive_max=12,
+                      backend='numpy', precision='float32'):
+        key = (cls, dim, max_nodes, damping, co_act_thresh, inactive_max, backend, precision)
+        template = _SEED_TEMPLATES.get(key)
+        if template is None:
+            template = cls(dim=dim, max_nodes=max_nodes, damping=damping, co_act_thresh=co_act_thresh,
+                           inactive_max=inactive_max, backend=backend, precision=precision)
+            template._share()
+            template._template = True
+            _SEED_TEMPLATES[key] = template
+        return template
+
+    @classmethod
+    def from_template(cls, template=None, **config):
+        # New session over a shared seed lattice; the networks are shared too
+        template = template if template is not None else cls.seed_template(**config)
+        net = cls.__new__(cls)
+        net.__dict__.update(template.__dict__)
+        net._init_session()
+        net._template = False
+        net._evict_heap = []
+        net._heap_stale = True
+        net._field_dirty = set()
+        return net
+
+    def _share(self):
+        self._refresh_unit()
+        if self.matcher._dirty:
+            self.matcher._build()  # Sessions only read the automaton until they materialize
+        for name in _COW_ARRAYS:
+            getattr(self, name).flags.writeable = False  # A missed _materialize fails loudly
+        self._evict_heap = []
+        self._heap_stale = True
+        self._field_stale = True
+        self._shared = True
+
+    def _materialize(self):
+        # First write to a borrowed lattice: take private copies of everything mutable
+        if not self._shared:
+            return
+        self._check_template()
+        for name in _COW_ARRAYS:
+            setattr(self, name, getattr(self, name).copy())
+        self.index = dict(self.index)
+        self.names = list(self.names)
+        self.free_slots = list(self.free_slots)
+        self.family_codes = dict(self.family_codes)
+        self.family_names = list(self.family_names)
+        self.fam_count = list(self.fam_count)
+        self.opposites = dict(self.opposites)
+        self.edge_ids = dict(self.edge_ids)
+        self.incident = {slot: set(ids) for slot, ids in self.incident.items()}
+        self.char_slots = {ctype: set(slots) for ctype, slots in self.char_slots.items()}
+        self.matcher = copy.deepcopy(self.matcher)
+        self._field_dirty = set(self._field_dirty)
+        self._shared = False
+
+    def _check_template(self):
+        if self._template:
+            raise RuntimeError("seed templates are read-only; start a session with EmotionNet.from_template()")
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def freeze(self, jit=False):
+        # Serving fast path: frozen nets under inference mode (torch backend), optionally traced
+        self.nets.freeze(jit=jit)
+        return self
+
+    def live_slots(self):
+        return np.flatnonzero(self.alive)
+
+    def family_of(self, node):
+        code = self.fam_codes[self.index[node]]
+        return self.family_names[code] if code >= 0 else None
+
+    def _family_code(self, family):
+        if family not in self.family_codes:
+            self.family_codes[family] = len(self.family_names)
+            self.family_names.append(family)
+            self.fam_count.append(0)
+        return self.family_codes[family]
+
+    def _alloc_slot(self, node):
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = len(self.names)  # Eviction at max_nodes keeps this inside the arrays
+            self.names.append(None)
+        self.names[slot] = node
+        self.index[node] = slot
+        self.alive[slot] = True
+        self.incident[slot] = set()
+        self.matcher.add(node)
+        if self.prof is not None:
+            self.prof.counts['added'] += 1
+        self._index_archetypes(slot, node)
+        self.graph_version += 1
+        return slot
+
+    def _index_archetypes(self, slot, node):
+        # Routing candidates: a node serves every archetype with a CHAR_MAP emotion in its name
+        for ctype, cands in CHAR_MAP.items():
+            if any(c in node for c in cands):
+                self.char_slots[ctype].add(slot)
+
+    def _free_slot(self, node):
+        slot = self.index.pop(node)
+        for eid in sorted(self.incident[slot], reverse=True):  # High ids first: swaps never hit the set
+            self._remove_edge(eid)
+        del self.incident[slot]
+        self.matcher.remove(node)
+        for cands in self.char_slots.values():
+            cands.discard(slot)
+        if self.hist_count[slot]:  # Drop it from history so a reused slot starts clean
+            self.hist_slots[self.hist_slots == slot] = -1
+            self.hist_count[slot] = 0
+        self.names[slot] = None
+        self.alive[slot] = False
+        self.graph_version += 1
+        self.vals[slot] = 0.0
+        self.push_res[slot] = 0.0
+        self.wdeg[slot] = 0.0  # Edges are gone; clears float drift
+        self.inactive[slot] = 0
+        self.fam_count[self.fam_codes[slot]] -= 1
+        self.fam_codes[slot] = -1
+        self.free_slots.append(slot)
 
-        self.seed_emergence_block()
-        self._spectral_init()
+    def add_edge(self, a, b, weight, type):
+        # Undirected spring between two live nodes; re-adding updates weight/type
+        self._materialize()
+        sa, sb = self.index[a], self.index[b]
+        if sa == sb:
+            return  # No self-springs
+        key = (min(sa, sb), max(sa, sb))
+        eid = self.edge_ids.get(key)
+        if eid is None:
+            if self.n_edges == len(self.e_src):
+                self._grow_edges()
+            eid = self.n_edges
+            self.n_edges += 1
+            self.graph_version += 1
+            self.e_src[eid], self.e_dst[eid] = key
+            self.edge_ids[key] = eid
+            self.incident[sa].add(eid)
+            self.incident[sb].add(eid)
+        else:
+            self.wdeg[[sa, sb]] -= abs(float(self.e_w[eid]))
+            if self.e_w[eid] != np.float32(weight):
+                self.graph_version += 1  # Re-weighting changes the spectrum too
+        self.e_w[eid] = weight
+        self.e_type[eid] = EDGE_CODES[type]
+        self.wdeg[[sa, sb]] += abs(float(self.e_w[eid]))
+        if not self._field_stale:
+            self._field_dirty.update(key)
+
+    def has_edge(self, a, b):
+        sa, sb = self.index.get(a), self.index.get(b)
+        return sa is not None and sb is not None and (min(sa, sb), max(sa, sb)) in self.edge_ids
+
+    def _remove_edge(self, eid):
+        # Swap-remove: move the last edge into the hole so live edges stay compact
+        key = (int(self.e_src[eid]), int(self.e_dst[eid]))
+        del self.edge_ids[key]
+        self.wdeg[list(key)] -= abs(float(self.e_w[eid]))
+        if not self._field_stale:
+            self._field_dirty.update(key)
+        self.incident[key[0]].discard(eid)
+        self.incident[key[1]].discard(eid)
+        last = self.n_edges - 1
+        if eid != last:
+            moved = (int(self.e_src[last]), int(self.e_dst[last]))
+            self.e_src[eid], self.e_dst[eid] = moved
+            self.e_w[eid], self.e_type[eid] = self.e_w[last], self.e_type[last]
+            self.edge_ids[moved] = eid
+            for end in moved:
+                self.incident[end].discard(last)
+                self.incident[end].add(eid)
+        self.n_edges = last
+        self.graph_version += 1
+
+    def _grow_edges(self):
+        cap = len(self.e_src) * 2
+        self.e_src = np.resize(self.e_src, cap)
+        self.e_dst = np.resize(self.e_dst, cap)
+        self.e_w = np.resize(self.e_w, cap)
+        self.e_type = np.resize(self.e_type, cap)
 
     def seed_emergence_block(self):
         # Aggressive smart seeding: Expand to ~60 nodes, VAD-inspired dims [valence, arousal, dominance, potency]
@@ -138,125 +812,728 @@ class EmotionNet:
         for a, b in opp_pairs:
             self.opposites[a] = b
             self.opposites[b] = a
-            if a in self.G and b in self.G:
-                self.G.add_edge(a, b, weight=0.35, type='opposite')  # Tension springs
+            if a in self.index and b in self.index:
+                self.add_edge(a, b, weight=0.35, type='opposite')  # Tension springs
 
         # Add spring edges between families for cluster dynamics
-        for n1, n2 in nx.combinations(self.G.nodes(), 2):
-            if self.families.get(n1) == self.families.get(n2) and random.random() < 0.1:
-                self.G.add_edge(n1, n2, weight=0.6, type='family_spring')
+        for n1, n2 in itertools.combinations(self.index, 2):
+            if self.fam_codes[self.index[n1]] == self.fam_codes[self.index[n2]] and random.random() < 0.1:
+                self.add_edge(n1, n2, weight=0.6, type='family_spring')
 
     def add_emotion(self, node, vec, val=0.29, family="mixed"):
-        if len(self.G) >= self.max_nodes:
-            self._prune_low()
-        if node not in self.G:
-            self.G.add_node(node, inactive=0)
+        self._materialize()
+        if node not in self.index:
+            if len(self.index) >= self.max_nodes:
+                self._prune_low()  # Only a new node needs a slot
             norm_vec = vec / np.linalg.norm(vec + 1e-8)
-            self.vectors[node] = norm_vec
-            self.vals[node] = val
-            self.families[node] = family
-            # Cluster tension: Connect to nearest in family
-            if family != "mixed":
-                sims = {n: 1 - cosine(norm_vec, self.vectors[n]) for n in self.G if self.families[n] == family and n != node}
-                if sims:
-                    closest = max(sims, key=sims.get)
-                    self.G.add_edge(node, closest, weight=sims[closest] * 0.8, type='cluster_spring')
+            code = self._family_code(family)
+            # Cluster tension: Connect to nearest in family (looked up before this node joins it)
+            closest = self.nearest(norm_vec, k=1, family=family) if family != "mixed" else []
+            slot = self._alloc_slot(node)
+            self.vecs[slot] = norm_vec
+            if not self._unit_stale:
+                v = self.vecs[slot].astype(self.compute_dtype)
+                self.unit[slot] = v / (np.linalg.norm(v) + 1e-8)
+            self.vals[slot] = val
+            if not self._field_stale:
+                self.push_res[slot] = float(self.vals[slot])  # Slot came back from 0
+            self.inactive[slot] = 0
+            self.fam_codes[slot] = code
+            self.fam_count[code] += 1
+            self._touch(slot)
+            if closest:
+                kin, sim = closest[0]
+                self.add_edge(node, kin, weight=sim * 0.8, type='cluster_spring')
+
+    # Vector index: cosine top-k as one matrix product over the unit-normalized rows
+    def nearest(self, vec, k=1, family=None):
+        return self.nearest_batch(np.asarray(vec)[None], k, family)[0]
+
+    def nearest_batch(self, vecs, k=1, family=None):
+        mask = self.alive
+        if family is not None:
+            code = self.family_codes.get(family)
+            if code is None:
+                return [[] for _ in range(len(vecs))]
+            mask = mask & (self.fam_codes == code)
+        slots, sims = self._topk_slots(np.asarray(vecs, dtype=np.float32), k, mask)
+        return [[(self.names[s], float(v)) for s, v in zip(row_s, row_v)] for row_s, row_v in zip(slots, sims)]
+
+    def _topk_slots(self, queries, k, mask):
+        # (Q, dim) queries -> (Q, k') best slots under mask and their cosine sims, best first
+        cand = np.flatnonzero(mask)
+        k = min(k, len(cand))
+        if k == 0:
+            return np.zeros((len(queries), 0), dtype=np.int64), np.zeros((len(queries), 0), dtype=np.float32)
+        self._refresh_unit()
+        q = queries / (np.linalg.norm(queries, axis=1, keepdims=True) + 1e-8)
+        sims = q @ self.unit[cand].astype(self.compute_dtype, copy=False).T
+        if k < len(cand):
+            top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(len(cand)), sims.shape)
+        top_sims = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_sims, axis=1, kind='stable')
+        return cand[np.take_along_axis(top, order, axis=1)], np.take_along_axis(top_sims, order, axis=1)
+
+    def _refresh_unit(self):
+        if self._unit_stale:
+            vecs = self.vecs.astype(self.compute_dtype, copy=False)
+            norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+            np.divide(vecs, norms + 1e-8, out=self.unit)
+            self._unit_stale = False
+
+    def _prune_key(self, slot):
+        return float(self.vals[slot]) - float(self.inactive[slot]) / self.inactive_max
+
+    def _touch(self, slot):
+        # Single-slot val change: push a fresh entry; the old one dies on key mismatch
+        if not self._heap_stale:
+            heapq.heappush(self._evict_heap, (self._prune_key(slot), slot))
+
+    def _nudge(self, slot, delta):
+        before = float(self.vals[slot])
+        self.vals[slot] += delta
+        if not self._field_stale:
+            self.push_res[slot] += float(self.vals[slot]) - before  # As stored, after rounding
+        self._touch(slot)
 
     def _prune_low(self):
-        # History-aware prune: Low val + high inactive, balance families
-        candidates = {n: self.vals[n] - (self.G.nodes[n]['inactive'] / self.inactive_max) for n in self.G}
-        low = min(candidates, key=candidates.get)
-        fam_count = {f: sum(1 for nn in self.G if self.families[nn] == f) for f in set(self.families.values())}
-        if fam_count[self.families[low]] > 5:  # Preserve balance
-            del self.vectors[low]
-            del self.vals[low]
-            del self.families[low]
-            self.G.remove_node(low)
+        # History-aware prune: Low val + high inactive, balance families (only evict from
+        # families above 5 live nodes, unless none qualify). O(log N) per eviction once built.
+        t0 = perf_counter() if self.prof is not None else 0.0
+        if self._heap_stale:
+            slots = self.live_slots()
+            keys = self.vals[slots].astype(np.float64) - self.inactive[slots] / self.inactive_max
+            self._evict_heap = list(zip(keys.tolist(), slots.tolist()))
+            heapq.heapify(self._evict_heap)
+            self._heap_stale = False
+        skipped = []
+        low = None
+        while self._evict_heap:
+            key, slot = heapq.heappop(self._evict_heap)
+            if not self.alive[slot] or key != self._prune_key(slot):
+                continue  # Stale: node gone or its val moved since this push
+            if self.fam_count[self.fam_codes[slot]] > 5:  # Preserve balance
+                low = slot
+                break
+            skipped.append((key, slot))
+        if low is None and skipped:
+            low = skipped.pop(0)[1]  # Every family at its floor: lowest overall still goes
+        for entry in skipped:
+            heapq.heappush(self._evict_heap, entry)
+        if low is not None:
+            self._free_slot(self.names[low])
+        if self.prof is not None:
+            self.prof.nested('prune', t0)
+            self.prof.counts['pruned'] += low is not None
 
     def propagate_tension(self):
         # Springy dynamics: Propagate vals with damping, vibrate on co-act
-        adj = nx.to_numpy_array(self.G)
-        node_list = list(self.G.nodes())
-        feats = torch.tensor([self.vectors[n] for n in node_list], dtype=torch.float32).to(self.device)
-        adj_t = torch.tensor(adj > 0, dtype=torch.float32).to(self.device)
-        updated_feats = self.gat_layer(feats, adj_t)
-        for i, n in enumerate(node_list):
-            self.vectors[n] = updated_feats[i].cpu().numpy()
-            self.vals[n] *= self.damping  # Decay
-            if self.vals[n] > self.co_act_thresh:
-                self.vals[n] += random.uniform(0.05, 0.15)  # Vibrate boost
-            self.G.nodes[n]['inactive'] += 1 if self.vals[n] < 0.1 else 0
+        if self.push_eps is not None:
+            self.propagate_push(self.push_eps)
+            return
+        if self.relax_iters is not None:
+            self.relax(self.relax_iters)
+            return
+        self._materialize()
+        n = self.n_edges
+        self._tension_step(self.vecs, self.vals, self.inactive, self.alive,
+                           self.e_src[:n], self.e_dst[:n], self.e_w[:n], self.e_type[:n])
+        self._unit_stale = True
+        self._heap_stale = True
+        self._field_stale = True
+
+    def _tension_step(self, vecs, vals, inactive, live, src, dst, w, etype):
+        # Works on any row-stacked view: one lattice, or a flattened batch with edges offset
+        # per session. Writes vecs/vals/inactive in place; rows outside `live` only pass through.
+        # Nets run in float32; reduced-precision storage is promoted here and rounded on write-back
+        spread = self._spread(vals, src, dst, w, etype)
+        self._gat_step(vecs, src, dst)
+        step = (vals[live].astype(self.compute_dtype, copy=False) + spread[live]) * self.damping  # Spread + decay
+        self._settle(vals, inactive, live, step)
+
+    def _gat_step(self, vecs, src, dst):
+        feats = vecs.astype(np.float32, copy=False)
+        vecs[:] = self.nets.gat(feats, np.concatenate([src, dst]), np.concatenate([dst, src]))  # Both ways
+
+    def _settle(self, vals, inactive, live, step):
+        if (self.edge_gains < 0).any():
+            np.maximum(step, 0.0, out=step)  # Opposite pushes can't drive a val negative
+        hot = step > self.co_act_thresh
+        step[hot] += np.random.uniform(0.05, 0.15, hot.sum())  # Vibrate boost
+        vals[live] = step
+        inactive[live] += step < 0.1
+
+    def relax(self, max_iters=20, tol=1e-3):
+        # Convergent mode: solve for the damped spread equilibrium x = b + S x, b = damping * vals,
+        # S = damping * spread, by Jacobi sweeps (S is a contraction: |S| <= damping * max |gain|).
+        # Sweeps start from b and stop once one moves no val by more than tol, so a quiet lattice
+        # (no spread to add, e.g. all gains zero) stops after one.
+        # One GAT pass and one vibrate/inactive update per call. Returns the sweeps used.
+        with self._lock:
+            self._materialize()
+            n = self.n_edges
+            src, dst, w, etype = self.e_src[:n], self.e_dst[:n], self.e_w[:n], self.e_type[:n]
+            live = self.alive
+            b = self.vals.astype(self.compute_dtype) * self.damping
+            x = b
+            iters = 0
+            while iters < max_iters:
+                iters += 1
+                nxt = b + self._spread(x, src, dst, w, etype) * self.damping
+                delta = float(np.abs(nxt[live] - x[live]).max(initial=0.0))
+                x = nxt
+                if delta < tol:
+                    break
+            self._gat_step(self.vecs, src, dst)
+            self._settle(self.vals, self.inactive, live, x[live])
+            self._unit_stale = True
+            self._heap_stale = True
+            self._field_stale = True
+            return iters
+
+    def fast_forward(self, k, horizon=None, vec_tol=1e-4):
+        # Idle catch-up for k input-free turns. The val recurrence (typed spread, decay, vibrate,
+        # inactive) is a contraction of rate damping * (1 + max |gain|), so only the first
+        # `horizon` steps still carry information from the start state (rate**horizon < 1e-3):
+        # those are stepped over the whole lattice as cheap vector ops.
+        # After that, only nodes at or above 0.1 and everything joined to them by spreading
+        # edges can still change their inactive counts or turn hot; that part (hot nodes and
+        # the neighbours they feed) keeps stepping until it goes quiet, and every other node
+        # takes its remaining steps as plain decay in closed form. Returns the steps stepped.
+        # Vecs (independent of vals) get up to k GAT passes over a moved-rows frontier, as in
+        # propagate_push, ending early once no row moves by more than vec_tol.
+        if k <= 0:
+            return 0
+        with self._lock:
+            self._materialize()
+            if horizon is None:
+                rate = self.damping * (1 + float(np.abs(self.edge_gains).max()))
+                horizon = int(np.ceil(np.log(1e-3) / np.log(rate))) if rate < 1 else k
+            n = self.n_edges
+            src, dst, w, etype = self.e_src[:n], self.e_dst[:n], self.e_w[:n], self.e_type[:n]
+            live = self.alive
+            rows = self.live_slots()
+            for _ in range(k):
+                if not len(rows):
+                    break
+                moved = rows[self._gat_rows(rows) > vec_tol]
+                if 2 * len(moved) > len(self.index):
+                    rows = self.live_slots()  # Most rows still moving: skip the frontier pass
+                else:
+                    rows = self._gat_frontier(moved[:0], moved)
+            steps = min(k, horizon)
+            for _ in range(steps):
+                spread = self._spread(self.vals, src, dst, w, etype)
+                step = (self.vals[live].astype(self.compute_dtype) + spread[live]) * self.damping
+                self._settle(self.vals, self.inactive, live, step)
+            active, seeds = live.copy(), None
+            while steps < k:
+                awake = active & (self.vals >= 0.1)
+                if seeds is None or (seeds & ~awake).any():  # A seed went quiet: shrink the region
+                    region = self._reach(awake, src, dst, w, etype)
+                    self._decay(np.flatnonzero(active & ~region), k - steps)
+                    active = region
+                    if not active.any():
+                        break
+                seeds = awake
+                sel = active[src] | active[dst]  # Every edge into the region, for its |w| degree
+                spread = self._spread(self.vals, src[sel], dst[sel], w[sel], etype[sel])
+                step = (self.vals[active].astype(self.compute_dtype) + spread[active]) * self.damping
+                self._settle(self.vals, self.inactive, active, step)
+                steps += 1
+            self._unit_stale = True
+            self._heap_stale = True
+            self._field_stale = True
+            return steps
+
+    def _reach(self, seeds, src, dst, w, etype):
+        # Seeds plus every node joined to them through edges that carry spread (non-zero gain)
+        carry = self.edge_gains[etype] * w != 0
+        src, dst = src[carry], dst[carry]
+        region = seeds.copy()
+        while True:
+            grow = np.zeros_like(region)
+            grow[dst[region[src]]] = True
+            grow[src[region[dst]]] = True
+            grow &= ~region
+            if not grow.any():
+                return region
+            region |= grow
+
+    def _decay(self, slots, n):
+        # n plain decay steps per slot: val * damping**n, inactive += steps ending below 0.1.
+        # Floored at the smallest normal value, so a long idle span never zeroes a val.
+        v = self.vals[slots].astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            first = np.where(v < 0.1, 1, np.floor(np.log(0.1 / v) / np.log(self.damping)) + 1)
+        self.inactive[slots] += np.clip(n - first + 1, 0, n).astype(self.inactive.dtype)
+        floor = np.finfo(self.dtype if self.dtype.kind == 'f' else np.float32).tiny  # bfloat16: float32's range
+        self.vals[slots] = np.maximum(v * self.damping ** n, floor)
+
+    def propagate_push(self, eps=5e-3):
+        # Push-style step (cf. approximate personalized PageRank): decay is a uniform scale and
+        # is applied to vals, residuals and the spread field in closed form; only nodes whose
+        # accumulated residual exceeds eps push it along their edges. The GAT likewise only
+        # reruns rows whose inputs changed: rows whose vec last moved by more than eps, their
+        # neighbours, and rows whose edges changed (every row after a field rebuild).
+        # Per-step cost follows the active neighbourhood, not the edge count; eps=0 is the
+        # full step. Returns the number of nodes pushed.
+        with self._lock:
+            self._materialize()
+            field, res = self.push_field, self.push_res
+            dirty = np.fromiter(self._field_dirty, dtype=np.int64)
+            if self._field_stale:
+                self._field_rebuild()
+                rows = self.live_slots()
+            else:
+                if len(dirty):
+                    self._field_refresh(dirty)
+                rows = self._gat_frontier(dirty, self._vec_moved)
+            self._field_dirty.clear()
+            front = np.flatnonzero(np.abs(res) > eps)  # Last step's changes plus nudges since
+            if len(front):
+                self._field_push(front)
+            live = self.alive
+            before = self.vals[live].astype(np.float64)
+            field *= self.damping  # spread is linear: scaling vals - res scales the field
+            res *= self.damping
+            self._settle(self.vals, self.inactive, live, (before * self.damping + field[live]).astype(self.compute_dtype))
+            res[live] += self.vals[live] - before * self.damping  # Spread + vibrate part, pushed next step
+            moved = self._gat_rows(rows) if len(rows) else np.zeros(0)
+            self._vec_moved = rows[moved > eps]
+            self._unit_stale = True
+            self._heap_stale = True
+            return len(front)
+
+    def _gat_frontier(self, dirty, vec_moved):
+        rows = np.zeros(self.max_nodes, dtype=bool)
+        rows[dirty] = True
+        if len(vec_moved):  # They and their neighbours get new messages
+            n = self.n_edges
+            src, dst = self.e_src[:n], self.e_dst[:n]
+            moved = np.zeros(self.max_nodes, dtype=bool)
+            moved[vec_moved] = True
+            touched = moved[src] | moved[dst]
+            rows[src[touched]] = True
+            rows[dst[touched]] = True
+            rows |= moved
+        return np.flatnonzero(rows & self.alive)
+
+    def _front_edges(self, nodes):
+        eids = np.fromiter(set().union(*(self.incident[u] for u in nodes.tolist())), dtype=np.int64)
+        return eids, self.e_src[eids], self.e_dst[eids]
+
+    def _field_rebuild(self):
+        n = self.n_edges
+        self.push_res[:] = 0.0
+        self.push_field[:] = self._spread(self.vals, self.e_src[:n], self.e_dst[:n], self.e_w[:n], self.e_type[:n])
+        self._field_stale = False
+
+    def _field_refresh(self, nodes):
+        # Exact field for nodes whose edges changed: spread over their incident edges only
+        nodes = nodes[self.alive[nodes]]
+        if not len(nodes):
+            return
+        eids, a, b = self._front_edges(nodes)
+        y = self.vals.astype(np.float64) - self.push_res
+        gw = self.edge_gains[self.e_type[eids]] * self.e_w[eids]
+        mine = np.zeros(self.max_nodes, dtype=bool)
+        mine[nodes] = True
+        pull = np.zeros(self.max_nodes)
+        np.add.at(pull, b[mine[b]], (gw * y[a])[mine[b]])
+        np.add.at(pull, a[mine[a]], (gw * y[b])[mine[a]])
+        self.push_field[nodes] = pull[nodes] / np.maximum(self.wdeg[nodes], 1e-8)
+
+    def _field_push(self, front):
+        eids, a, b = self._front_edges(front)
+        res = self.push_res
+        gw = self.edge_gains[self.e_type[eids]] * self.e_w[eids]
+        hot = np.zeros(self.max_nodes, dtype=bool)
+        hot[front] = True
+        wdeg = np.maximum(self.wdeg, 1e-8)
+        np.add.at(self.push_field, b[hot[a]], (gw * res[a] / wdeg[b])[hot[a]])
+        np.add.at(self.push_field, a[hot[b]], (gw * res[b] / wdeg[a])[hot[b]])
+        res[front] = 0.0
+
+    def _gat_rows(self, rows):
+        # GAT messages into `rows` only; every other row keeps its vec this step.
+        # Returns how far each row's vec moved (max abs change).
+        n = self.n_edges
+        if len(rows) == len(self.index):  # Every live row: the full both-ways edge list
+            src = np.concatenate([self.e_src[:n], self.e_dst[:n]])
+            dst = np.concatenate([self.e_dst[:n], self.e_src[:n]])
+        else:
+            if 2 * len(rows) > len(self.index):  # Most of the lattice: one pass over the edge arrays
+                a, b = self.e_src[:n], self.e_dst[:n]
+            else:
+                _, a, b = self._front_edges(rows)
+            into = np.zeros(self.max_nodes, dtype=bool)
+            into[rows] = True
+            src = np.concatenate([a[into[b]], b[into[a]]])
+            dst = np.concatenate([b[into[b]], a[into[a]]])
+        out = self.nets.gat(self.vecs.astype(np.float32), src, dst)
+        moved = np.abs(out[rows] - self.vecs[rows]).max(axis=1, initial=0.0)
+        self.vecs[rows] = out[rows]
+        return moved
+
+    def _spread(self, vals, src, dst, w, etype):
+        # Typed val spread, one kernel for every edge type: each node gets the |w|-normalized
+        # sum of its neighbours' vals, each edge scaled by w * gain[type] (|result| <= max gain)
+        n = len(vals)
+        if not self.edge_gains.any():  # Default: no spread, skip the edge pass
+            return np.zeros(n, dtype=self.compute_dtype)
+        v = vals.astype(self.compute_dtype, copy=False)
+        gw = self.edge_gains[etype] * w
+        pull = np.bincount(dst, gw * v[src], minlength=n) + np.bincount(src, gw * v[dst], minlength=n)
+        deg = np.bincount(dst, np.abs(w), minlength=n) + np.bincount(src, np.abs(w), minlength=n)
+        return (pull / np.maximum(deg, 1e-8)).astype(self.compute_dtype)
+
+    def set_edge_gain(self, type, gain):
+        self._check_template()  # Sessions made later would inherit the gains
+        gains = self.edge_gains.copy()  # Rebind, never write: templates share the array
+        gains[EDGE_CODES[type]] = gain
+        self.edge_gains = gains
+        self._field_stale = True
+
+    def edges_of_type(self, type):
+        # (src slots, dst slots, weights) for one edge type, e.g. every opposite tension pair
+        n = self.n_edges
+        sel = np.flatnonzero(self.e_type[:n] == EDGE_CODES[type])
+        return self.e_src[sel], self.e_dst[sel], self.e_w[sel]
 
     def process_text_input(self, text):
+        with self._lock:
+            self._ingest(text)
+
+    def _ingest(self, text):
         # Upgraded: Semantic fuzzy (simple keyword + sim), OCC appraisal sim (basic event parse)
+        if self.prof is not None:
+            self.prof.start()
         text_lower = text.lower()
-        matches = []
-        for n in self.vals:
-            if n in text_lower or any(word in text_lower for word in n.split('-')):
-                matches.append(n)
+        self._ingest_matches(self._match(text_lower), _has_event(text_lower))
+
+    def _ingest_matches(self, matches, event):
+        # Everything after matching; shared by whole-message and streamed input
+        self._materialize()
+        prof = self.prof
+        if prof is not None:
+            prof.lap('match')
+            prof.counts['matched'] += len(matches)
         if not matches:
-            # Fuzzy spawn: Closest sim + noise
-            query_vec = np.random.normal(0, 0.1, self.dim)  # Placeholder; real NLP would embed text
-            sims = {n: 1 - cosine(query_vec, self.vectors[n]) for n in self.vectors}
-            strongest = max(sims, key=sims.get)
-            new_vec = self.vectors[strongest] + np.random.normal(0, 0.12, self.dim)
-            self.add_emotion(f"fracture_{self.turn}", new_vec, val=0.28)
+            self._fracture()
+            if prof is not None:
+                prof.lap('fracture')
             return
 
         # Multi-blend with MLP
-        weights = [self.vals[m] for m in matches]
-        vecs = [self.vectors[m] for m in matches]
-        avg_vec = np.average(vecs, weights=weights, axis=0)
+        weights, avg_vec, concat = self._blend_inputs(matches)
+        blend_vec = self.nets.blend(concat[None])[0]
+        co_act = self._apply_blend(matches, weights, blend_vec, event)
+        if prof is not None:
+            prof.lap('blend')
+
+        # Temporal: advance the carried LSTM state one step, nudge last turn's nodes
+        x = avg_vec.astype(np.float32)
+        h, c = self.nets.lstm_step(x[None], self.lstm_h[None], self.lstm_c[None])
+        self._apply_temporal(h[0], c[0])
+        self._push_history(matches)
+        if prof is not None:
+            prof.lap('lstm')
+
+        if self._ticker is not None:
+            self._dirty.set()  # Ticker owns propagation; coalesces bursts into one pass
+        else:
+            self.propagate_tension()  # Always propagate after input
+            if prof is not None:
+                prof.lap('propagate')
+        self._resonance(co_act)
+
+    # Background tick loop: moves propagate_tension off the request path
+    def start_ticker(self, interval=0.05, idle=False):
+        # Propagate at most once per `interval` while dirty; idle=True also ticks a quiet lattice
+        if self._ticker is not None:
+            return
+        stop = threading.Event()
+        thread = threading.Thread(target=self._tick_loop, args=(interval, idle, stop), daemon=True)
+        self._ticker = (thread, stop)
+        thread.start()
+
+    def stop_ticker(self, flush=True):
+        if self._ticker is None:
+            return
+        with self._lock:
+            thread, stop = self._ticker
+            self._ticker = None  # Ingestion from here on propagates inline again
+            pending = self._dirty.is_set()
+            stop.set()
+            self._dirty.set()  # Wake the loop so it sees stop
+        thread.join()
+        if flush and pending:
+            self.flush()  # No-op if the loop already ran the pending tick
+        self._dirty.clear()
+
+    def __getstate__(self):
+        # Copies/pickles get their own lock and start without a ticker; a copy of a seed
+        # template is an ordinary (borrowing) lattice, not the cached template
+        state = self.__dict__.copy()
+        del state['_lock'], state['_ticker']
+        state['_template'] = False
+        state['_dirty'] = self._dirty.is_set()  # A pending tick carries over
+        return state
+
+    def __setstate__(self, state):
+        dirty = state.pop('_dirty')
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        self._dirty = threading.Event()
+        if dirty:
+            self._dirty.set()
+        self._ticker = None
+
+    def flush(self):
+        # Run any pending propagation now (e.g. before a read that must include the last input)
+        with self._lock:
+            if self._dirty.is_set():
+                self._tick()
+
+    def _tick_loop(self, interval, idle, stop):
+        last = 0.0
+        while not stop.is_set():
+            if not idle:
+                self._dirty.wait()
+            wait = interval - (perf_counter() - last)
+            if wait > 0 and stop.wait(wait):
+                break
+            if stop.is_set():
+                break
+            with self._lock:
+                if idle or self._dirty.is_set():
+                    self._tick()
+            last = perf_counter()
+
+    def _tick(self):
+        t0 = perf_counter()
+        self._dirty.clear()
+        self.propagate_tension()
+        if self.prof is not None:
+            self.prof.record('propagate', perf_counter() - t0)
+
+    def profile(self, enabled=True, window=256):
+        # Toggle per-stage instrumentation; re-enabling starts fresh counters
+        self.prof = StageProfiler(window) if enabled else None
+
+    def stats(self):
+        return self.prof.stats() if self.prof is not None else {}
+
+    # Input stages, shared with BatchedEmotionNet so the nets can run once per batch
+    def _match(self, text_lower):
+        return sorted(self.matcher.match(text_lower), key=self.index.get)
+
+    # Streaming input: feed() scans each chunk as it arrives, resuming the matcher state across
+    # chunk boundaries, and reports newly matched nodes; finish() applies the whole message
+    # once (blend, LSTM, one propagation), exactly as process_text_input would have.
+    def feed(self, chunk):
+        with self._lock:
+            st = self._stream
+            if st is None:
+                st = self._stream = SimpleNamespace(state=0, generation=self.matcher.generation, parts=set(),
+                                                    emitted=set(self.matcher.always), event=False, tail='')
+                fresh = set(st.emitted)
+            else:
+                fresh = set()
+            if st.generation != self.matcher.generation:  # Trie was rebuilt under us: restart the scan
+                st.state, st.generation = 0, self.matcher.generation
+            low = chunk.lower()
+            parts, st.state = self.matcher.find_parts(low, st.state)
+            for part in parts - st.parts:
+                fresh |= self.matcher.owners[part]
+            st.parts |= parts
+            fresh -= st.emitted
+            st.emitted |= fresh
+            joined = st.tail + low  # Event words may straddle the boundary
+            st.event = st.event or _has_event(joined)
+            st.tail = joined[-(EVENT_SPAN - 1):]
+            return sorted((n for n in fresh if n in self.index), key=self.index.get)
+
+    def finish(self):
+        with self._lock:
+            st, self._stream = self._stream, None
+            if self.prof is not None:
+                self.prof.start()
+            nodes = set(self.matcher.always)
+            if st is not None:
+                for part in st.parts:
+                    nodes |= self.matcher.owners.get(part, set())
+            self._ingest_matches(sorted(nodes, key=self.index.get), st is not None and st.event)
+
+    # Bulk replay (e.g. rebuilding a lattice from a chat log): one matcher pass over every
+    # message up front, then windows of `propagate_every` messages (None = one window). Per
+    # window the fracture lookups and blend MLP run batched against the window-start lattice,
+    # messages are applied in order (patterns resolved to live nodes then), each later one
+    # after a coast step (decay + vibrate, no spread/GAT) standing in for the propagation it
+    # would have followed, and one full propagation closes the window.
+    # propagate_every=1 keeps process_text_input's cadence.
+    def process_text_batch(self, texts, propagate_every=1):
+        with self._lock:
+            self._materialize()
+            scans = []
+            for text in texts:
+                low = text.lower()
+                scans.append((self.matcher.find_parts(low)[0], _has_event(low)))
+            window = propagate_every or max(len(scans), 1)
+            for start in range(0, len(scans), window):
+                stepped = self._replay_window(scans[start:start + window])
+                if not stepped:
+                    continue
+                if self._ticker is not None:
+                    self._dirty.set()
+                    continue
+                self.propagate_tension()
+
+    def _replay_window(self, scans):
+        always, owners = self.matcher.always, self.matcher.owners
+        matched = [sorted(always.union(*(owners.get(p, ()) for p in parts)), key=self.index.get)
+                   for parts, _ in scans]
+        n_frac = sum(1 for m in matched if not m)
+        strongest = iter(())
+        if n_frac:
+            queries = np.random.normal(0, 0.1, (n_frac, self.dim))  # Placeholder, as in _fracture
+            strongest = iter(self._topk_slots(queries, 1, self.alive)[0][:, 0])
+        jobs = [self._blend_inputs(m) for m in matched if m]
+        if jobs:
+            blend_vecs = iter(self.nets.blend(np.stack([job[2] for job in jobs])))
+            jobs = iter(jobs)
+        stepped = 0
+        for matches, (_, event) in zip(matched, scans):
+            if not matches:
+                self._fracture(next(strongest))
+                continue
+            weights, avg_vec, _ = next(jobs)
+            blend_vec = next(blend_vecs)
+            matches = [m for m in matches if m in self.index]  # An earlier message may have pruned it
+            if not matches:
+                continue
+            if stepped:
+                self._coast()  # The step sequential replay ran after the previous message
+            self._apply_blend(matches, weights, blend_vec, event)
+            x = avg_vec.astype(np.float32)
+            h, c = self.nets.lstm_step(x[None], self.lstm_h[None], self.lstm_c[None])
+            self._apply_temporal(h[0], c[0])
+            self._push_history(matches)
+            stepped += 1
+        return stepped
+
+    def _coast(self):
+        # Propagation minus the spread and GAT: decay, vibrate and inactive counts only
+        live = self.alive
+        self._settle(self.vals, self.inactive, live, self.vals[live].astype(self.compute_dtype) * self.damping)
+        self._heap_stale = True
+        self._field_stale = True
+
+    def _fracture(self, strongest=None):
+        # Fuzzy spawn: Closest sim + noise
+        if strongest is None or not self.alive[strongest]:
+            query_vec = np.random.normal(0, 0.1, self.dim)  # Placeholder; real NLP would embed text
+            strongest = self._topk_slots(query_vec[None], 1, self.alive)[0][0, 0]
+        new_vec = self.vecs[strongest] + np.random.normal(0, 0.12, self.dim)
+        self.add_emotion(f"fracture_{self.turn}", new_vec, val=0.28)
+
+    def _blend_inputs(self, matches):
+        match_slots = [self.index[m] for m in matches]
+        weights = self.vals[match_slots].astype(self.compute_dtype)
+        vecs = self.vecs[match_slots].astype(self.compute_dtype)
+        avg_vec = np.average(vecs, weights=weights, axis=0) if weights.sum() > 0 else vecs.mean(axis=0)
         min_vec, max_vec = np.min(vecs, axis=0), np.max(vecs, axis=0)
-        concat = torch.tensor(np.concatenate([avg_vec, min_vec, max_vec])).float().to(self.device)
-        blend_vec = self.blend_mlp(concat.unsqueeze(0)).squeeze().cpu().numpy()
-        co_act = max(weights)
+        return weights, avg_vec, np.concatenate([avg_vec, min_vec, max_vec]).astype(np.float32)
+
+    def _apply_blend(self, matches, weights, blend_vec, event):
+        co_act = float(max(weights))
         if co_act > self.co_act_thresh:
             blend_name = "-".join(sorted(matches[:4])) if len(matches) > 1 else matches[0]
             self.add_emotion(blend_name, blend_vec, val=co_act * 0.92)
             for m in matches:
-                self.G.add_edge(blend_name, m, weight=0.82, type='blend_spring')
+                if m in self.index:  # Blend insert may have pruned a match
+                    self.add_edge(blend_name, m, weight=0.82, type='blend_spring')
             # Appraisal sim: Boost if text has event words (crude)
-            if any(word in text_lower for word in ['event', 'agent', 'object', 'cause', 'relief']):
-                self.vals[blend_name] += 0.1  # OCC nudge
-
-        # Temporal: Append to history, LSTM predict next
-        if len(self.history) > 0:
-            seq = torch.tensor([list(self.history[-1].values()) + [avg_vec]]).float().to(self.device)
-            next_pred, _ = self.temporal_lstm(seq)
-            # Use pred to adjust vals (e.g., forecast decay)
-            for i, n in enumerate(self.history[-1]):
-                self.vals[n] += next_pred[0, i].mean().item() * 0.05
-        self.history.append({n: self.vectors[n] for n in matches[:5]})  # Track top
-        if len(self.history) > 10:
-            self.history.pop(0)
-
-        self.propagate_tension()  # Always propagate after input
+            if event:
+                self._nudge(self.index[blend_name], 0.1)  # OCC nudge
+        return co_act
+
+    def _apply_temporal(self, h, c):
+        self.lstm_h[:] = h
+        self.lstm_c[:] = c
+        # Use pred to adjust vals (e.g., forecast decay)
+        if self.hist_steps:
+            delta = float(h.mean()) * 0.05
+            for slot in self.hist_slots[(self.hist_steps - 1) % HIST_TURNS]:
+                if slot >= 0:
+                    self._nudge(slot, delta)
+
+    def _push_history(self, matches):
+        row = self.hist_steps % HIST_TURNS
+        old = self.hist_slots[row]
+        self.hist_count[old[old >= 0]] -= 1  # Overwrite the oldest turn
+        old[:] = -1
+        slots = [self.index[n] for n in matches[:HIST_WIDTH] if n in self.index]  # Track top
+        old[:len(slots)] = slots
+        self.hist_count[slots] += 1
+        self.hist_steps += 1
+
+    def _resonance(self, co_act):
         if co_act > 0.82 and random.random() < 0.28:
             print("🌌 Resonance cascade — lattice vibrating with tension.")
 
-    def route_emotion_to_character(self, character_type: str, context: str = "") -> dict:
-        # Dynamic: Multi-blend output, family boost, learn from history
-        char_map = {
-            "tsundere": ["anger", "tenderness", "longing", "defiance"],
-            "yandere": ["obsession", "lust", "rage", "love"],
-            "gentle": ["compassion", "warmth", "serenity", "trust"],
-            "chaotic": ["defiance", "ecstasy", "rage", "surprise"],
-            "brooding": ["melancholy", "yearning", "ache", "resentment"],
-            "sunshine": ["joy", "delight", "wonder", "anticipation"],
-        }
-        candidates = char_map.get(character_type.lower(), list(self.vals.keys()))
-        scores = {}
-        for emo in self.G.nodes():
-            if emo in candidates or any(c in emo for c in candidates):
-                boost = 1.2 if self.families.get(emo) in ["dark", "chaotic"] else 1.0
-                hist_boost = sum(1 for h in self.history if emo in h) * 0.05  # Learn from seqs
-                scores[emo] = self.vals.get(emo, 0) * boost + hist_boost
-        if not scores:
-            return {max(self.vals, key=self.vals.get): self.vals[max(self.vals, key=self.vals.get)]}
+    def route_emotion_to_character(self, character_type: str, context: str = "", top_k=None) -> dict:
+        # Dynamic: Multi-blend output, family boost, learn from history. Scores only the
+        # archetype's indexed candidates; top_k caps the output via partial selection.
+        with self._lock:
+            slots = self._route_candidates(character_type)
+            if not len(slots):
+                return self._route_fallback()
+            return self._route_pick(slots, self._route_scores(slots), top_k)
+
+    def route_emotion_to_characters(self, character_types, context: str = "", top_k=None) -> dict:
+        # Several personas per turn: one scoring pass over the live lattice, then each
+        # archetype just gathers its candidate slots out of the shared score row
+        with self._lock:
+            live = self.live_slots()
+            scores = np.zeros(self.max_nodes)
+            scores[live] = self._route_scores(live)
+            out = {}
+            for ctype in character_types:
+                slots = self._route_candidates(ctype)
+                out[ctype] = self._route_pick(slots, scores[slots], top_k) if len(slots) else self._route_fallback()
+            return out
+
+    def _route_candidates(self, character_type):
+        cands = self.char_slots.get(character_type.lower())
+        if cands is None:
+            return self.live_slots()
+        return np.sort(np.fromiter(cands, dtype=np.int64, count=len(cands)))
+
+    def _route_fallback(self):
+        slots = self.live_slots()
+        top = slots[np.argmax(self.vals[slots])]
+        return {self.names[top]: float(self.vals[top])}
+
+    def _route_pick(self, slots, scores, top_k):
         # Multi: Top-N > thresh
-        sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        return {k: v for k, v in sorted_scores if v > 0.45}  # Thresh for blends
+        keep = np.flatnonzero(scores > 0.45)  # Thresh for blends
+        if top_k is not None and len(keep) > top_k:
+            keep = keep[np.argpartition(-scores[keep], top_k - 1)[:top_k]]
+            keep.sort()
+        keep = keep[np.argsort(-scores[keep], kind='stable')]
+        return {self.names[slots[i]]: float(scores[i]) for i in keep}
+
+    def _route_scores(self, slots):
+        boost = np.where(np.isin(self.fam_codes[slots], self._boost_codes()), 1.2, 1.0)
+        hist = self.hist_count[slots] * 0.05  # Learn from seqs
+        return self.vals[slots].astype(np.float64) * boost + hist
+
+    def _boost_codes(self):
+        return [self.family_codes[f] for f in ("dark", "chaotic") if f in self.family_codes]
 
     def get_character_reaction(self, user_text: str, character_type: str):
         self.process_text_input(user_text)
@@ -267,17 +1544,379 @@ class EmotionNet:
         return self.get_character_reaction(user_text, character_type)
 
     def check_visual_resonance(self):
-        strong = [v for v in self.vals.values() if v > 0.88]
-        if len(strong) >= 4 and random.random() < 0.3:
+        strong = self.vals[self.alive] > 0.88
+        if strong.sum() >= 4 and random.random() < 0.3:
             return "🌌 Tension overflow — visual cascade imminent."
         return None
 
     def _spectral_init(self):
-        # Placeholder for full spectral clustering; use nx for now
-        if len(self.G) > 10:
-            laps = nx.normalized_laplacian_matrix(self.G)
-            # Eigen sim for init adjustment (torch)
-            eig = torch.linalg.eig(torch.tensor(laps.todense()).float().to(self.device))[0]
-            # Crude: Adjust dims if imbalance
-            if eig.std().item() > 0.5:
-                print("Spectral init: Lattice tension balanced.")
+        # Crude: Adjust dims if imbalance, judged from the extreme Laplacian eigenvalues
+        if len(self.index) > 10 and self.spectral_stats()['spread'] > 0.5:
+            print("Spectral init: Lattice tension balanced.")
+
+    def spectral_stats(self, k=6, refresh=False):
+        # k lowest + k highest eigenpairs of the normalized Laplacian with a sparse block solver
+        # (LOBPCG copes with the repeated eigenvalues a multi-component lattice has, where
+        # single-vector Lanczos drops copies). Cached on graph_version; a refresh after edits
+        # warm-starts from the previous eigenvector blocks.
+        cache = self._spectral
+        if cache is not None and cache['version'] == self.graph_version and not refresh:
+            return cache['stats']
+        slots = self.live_slots()
+        lap = self._normalized_laplacian(slots)
+        linked = lap.diagonal() != 0  # Isolated nodes are exact (0, e_i) pairs: no solve needed
+        core_slots = slots[linked]
+        core = lap[linked][:, linked]
+        n = len(core_slots)
+        k = max(1, min(k, len(slots) // 2))
+        if n > 5 * k + 10:
+            x_low, x_high = self._spectral_warm_start(cache, core_slots, k)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")  # Loose-tolerance exits are fine for stats
+                low_vals, low_vecs = lobpcg(core, x_low, largest=False, tol=1e-5, maxiter=100)
+                high_vals, high_vecs = lobpcg(core, x_high, largest=True, tol=1e-5, maxiter=100)
+            low_order, high_order = np.argsort(low_vals), np.argsort(high_vals)
+            low_vals, low_vecs = low_vals[low_order], low_vecs[:, low_order]
+            high_vals, high_vecs = high_vals[high_order], high_vecs[:, high_order]
+        else:  # Tiny lattice: dense solve is cheaper than iterating
+            dense_vals, dense_vecs = np.linalg.eigh(core.toarray()) if n else (np.zeros(0), np.zeros((0, 0)))
+            low_vals, low_vecs = dense_vals[:k], dense_vecs[:, :k]
+            high_vals, high_vecs = dense_vals[-k:], dense_vecs[:, -k:]
+        isolated = np.zeros(min(int((~linked).sum()), k))
+        low = np.sort(np.concatenate([isolated, low_vals]))[:k]
+        high = np.sort(np.concatenate([isolated, high_vals]))[-k:]
+        extremes = np.concatenate([low, high])
+        stats = {
+            'version': self.graph_version,
+            'nodes': len(slots),
+            'isolated': int((~linked).sum()),
+            'low': low.tolist(),
+            'high': high.tolist(),
+            'spread': float(extremes.std()) if len(extremes) else 0.0,
+        }
+        self._spectral = {'version': self.graph_version, 'stats': stats,
+                          'low_vecs': self._slot_rows(core_slots, low_vecs),
+                          'high_vecs': self._slot_rows(core_slots, high_vecs)}
+        return stats
+
+    def _normalized_laplacian(self, slots):
+        pos = np.full(len(self.alive), -1)
+        pos[slots] = np.arange(len(slots))
+        src, dst = pos[self.e_src[:self.n_edges]], pos[self.e_dst[:self.n_edges]]
+        adj = coo_matrix((self.e_w[:self.n_edges].astype(np.float64), (src, dst)), shape=(len(slots), len(slots)))
+        return laplacian((adj + adj.T).tocsr(), normed=True).tocsr()
+
+    def _slot_rows(self, slots, vecs):
+        rows = np.zeros((len(self.alive), vecs.shape[1]), dtype=np.float64)
+        rows[slots] = vecs
+        return rows
+
+    def _spectral_warm_start(self, cache, slots, k):
+        # Previous eigenvector blocks re-indexed onto the current slots. A column is reused only
+        # if most of its mass survived the edits; the rest (and a little noise, to keep the block
+        # full rank) come from a private stream so the lattice RNG is untouched.
+        rng = np.random.default_rng(self.graph_version)
+        blocks = []
+        for key in ('low_vecs', 'high_vecs'):
+            block = rng.standard_normal((len(slots), k))
+            if cache is not None:
+                prev = cache[key][slots][:, :k]
+                cols = np.flatnonzero(np.linalg.norm(prev, axis=0) > 0.9)
+                block[:, cols] = prev[:, cols] + 0.01 * block[:, cols]
+            blocks.append(block)
+        return blocks
+
+    # Accuracy check for reduced-precision storage: a float64 reference and a `precision`
+    # lattice built and driven from the same seeds (so same weights and the same noise),
+    # compared slot by slot afterwards. Caller's global RNG state is left untouched.
+    @classmethod
+    def check_precision(cls, precision='float16', texts=None, turns=200, seed=0, **config):
+        rng_state = random.getstate(), np.random.get_state()
+        try:
+            runs = []
+            for prec in ('float64', precision):
+                random.seed(seed)
+                np.random.seed(seed)
+                net = cls(precision=prec, **config)
+                if texts is None:
+                    pick = random.Random(seed)
+                    words = sorted(net.index)
+                    texts = [" ".join(pick.sample(words, pick.randint(0, 4))) for _ in range(turns)]
+                for text in texts:
+                    net.process_text_input(text)
+                    net.turn += 1
+                runs.append(net)
+        finally:
+            random.setstate(rng_state[0])
+            np.random.set_state(rng_state[1])
+        ref, low = runs
+        n = len(ref.names)
+        same = np.array([a is not None and a == b for a, b in zip(ref.names, low.names)] + [False] * (n - len(low.names)))
+        val_err = np.abs(ref.vals[:n][same] - low.vals[:n][same].astype(np.float64))
+        vec_err = np.abs(ref.vecs[:n][same] - low.vecs[:n][same].astype(np.float64))
+        routes = [(ref.route_emotion_to_character(c), low.route_emotion_to_character(c)) for c in CHAR_MAP]
+        return {
+            'precision': precision,
+            'turns': len(texts),
+            'names_match': float(same.sum() / max(len(ref.index), 1)),  # Same node in same slot
+            'max_val_err': float(val_err.max(initial=0.0)),
+            'mean_val_err': float(val_err.mean()) if len(val_err) else 0.0,
+            'max_vec_err': float(vec_err.max(initial=0.0)),
+            'route_match': float(np.mean([list(a)[:1] == list(b)[:1] for a, b in routes])),  # Top pick agrees
+            'bytes_per_node': (2 * ref.dim + 1) * low.dtype.itemsize,  # vecs + unit rows + val
+        }
+
+    # Snapshot: one uncompressed .npz (no pickles) holding slots, edges, tables, history and
+    # net weights. Restoring skips seeding/spectral init, so cold start is just a file read.
+    def save_snapshot(self, path):
+        with self._lock:  # Never write a half-propagated lattice
+            n_slots = len(self.names)
+            state = {
+                'version': np.array(SNAPSHOT_VERSION),
+                'config': np.array([self.dim, self.max_nodes, self.inactive_max, self.turn], dtype=np.int64),
+                'params': np.array([self.damping, self.co_act_thresh], dtype=np.float64),
+                'precision': np.array(self.precision),
+                'names': np.array([n if n is not None else '' for n in self.names], dtype=str),
+                'free_slots': np.array(self.free_slots, dtype=np.int64),
+                'vecs': _to_npz(self.vecs[:n_slots]),
+                'vals': _to_npz(self.vals[:n_slots]),
+                'inactive': self.inactive[:n_slots],
+                'fam_codes': self.fam_codes[:n_slots],
+                'family_names': np.array(self.family_names, dtype=str),
+                'edge_types': np.array(EDGE_TYPES, dtype=str),
+                'e_src': self.e_src[:self.n_edges],
+                'e_dst': self.e_dst[:self.n_edges],
+                'e_w': self.e_w[:self.n_edges],
+                'e_type': self.e_type[:self.n_edges],
+                'edge_gains': self.edge_gains,
+                'opposites': np.array(sorted(self.opposites.items()), dtype=str).reshape(-1, 2),
+                'hist_slots': self.hist_slots,
+                'hist_steps': np.array(self.hist_steps),
+                'lstm_state': np.stack([self.lstm_h, self.lstm_c]),
+            }
+            for key, weight in self.nets.export_weights().items():
+                state[f'w:{key}'] = weight
+            with open(path, 'wb') as f:  # File handle keeps np.savez from appending '.npz'
+                np.savez(f, **state)
+
+    @classmethod
+    def load_snapshot(cls, path, backend='numpy', precision=None):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != SNAPSHOT_VERSION:
+                raise ValueError(f"snapshot version {int(data['version'])} != {SNAPSHOT_VERSION}")
+            dim, max_nodes, inactive_max, turn = (int(x) for x in data['config'])
+            damping, co_act_thresh = (float(x) for x in data['params'])
+            if precision is None:  # Keep the saved storage precision unless asked to convert
+                precision = str(data['precision'])
+            net = cls(dim=dim, max_nodes=max_nodes, damping=damping, co_act_thresh=co_act_thresh,
+                      inactive_max=inactive_max, seed=False, backend=backend, precision=precision)
+            net.turn = turn
+            net._restore(data)
+        return net
+
+    def _restore(self, data):
+        names = [str(n) or None for n in data['names']]
+        n_slots = len(names)
+        self.names = names
+        self.free_slots = data['free_slots'].tolist()
+        saved = _storage_dtype(str(data['precision']))
+        self.vecs[:n_slots] = _from_npz(data['vecs'], saved)
+        self.vals[:n_slots] = _from_npz(data['vals'], saved)
+        self.inactive[:n_slots] = data['inactive']
+        self.fam_codes[:n_slots] = data['fam_codes']
+        for family in data['family_names']:
+            self._family_code(str(family))
+        for slot, node in enumerate(names):
+            if node is None:
+                continue
+            self.index[node] = slot
+            self.alive[slot] = True
+            self.incident[slot] = set()
+            self.matcher.add(node)
+            self._index_archetypes(slot, node)
+            self.fam_count[self.fam_codes[slot]] += 1
+        self._unit_stale = True
+        self._heap_stale = True
+        self._field_stale = True
+
+        type_codes = np.array([EDGE_CODES[str(t)] for t in data['edge_types']], dtype=np.int8)
+        for a, b, w, t in zip(data['e_src'].tolist(), data['e_dst'].tolist(), data['e_w'], data['e_type']):
+            self.add_edge(names[a], names[b], weight=w, type=EDGE_TYPES[type_codes[t]])
+        self.opposites = {str(a): str(b) for a, b in data['opposites']}
+        for t, gain in zip(data['edge_types'], data['edge_gains']):
+            self.edge_gains[EDGE_CODES[str(t)]] = gain
+
+        self.hist_slots[:] = data['hist_slots']
+        self.hist_steps = int(data['hist_steps'])
+        live = self.hist_slots[self.hist_slots >= 0]
+        self.hist_count[:] = np.bincount(live, minlength=self.max_nodes)
+        self.lstm_h[:], self.lstm_c[:] = data['lstm_state']
+
+        self.nets.load_weights({k[2:]: data[k] for k in data.files if k.startswith('w:')})
+
+
+class BatchedEmotionNet:
+    # B independent lattices stacked into padded (B, cap, ...) arrays. Each session's own
+    # arrays are views into its batch row, so single-session calls keep working, while a
+    # tick runs the blend MLP, LSTM and GAT once for every session that got input.
+    def __init__(self, batch_size=0, sessions=None, **net_kwargs):
+        given = list(sessions or [])
+        fresh = [EmotionNet(**net_kwargs) for _ in range(batch_size)]
+        self.sessions = given + fresh
+        if not self.sessions:
+            raise ValueError("BatchedEmotionNet needs at least one session")
+        self.lead = self.sessions[0]  # Owns the shared networks and propagation params
+        for net in self.sessions[1:]:
+            if net in fresh:
+                net.edge_gains = self.lead.edge_gains
+            self._share_nets(net, adopt=net in fresh)
+        self._stack()
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def add_session(self, net=None):
+        adopt = net is None
+        if adopt:
+            net = EmotionNet(dim=self.lead.dim, max_nodes=self.lead.max_nodes, damping=self.lead.damping,
+                             co_act_thresh=self.lead.co_act_thresh, inactive_max=self.lead.inactive_max,
+                             backend=self.lead.backend, precision=self.lead.precision)
+            net.edge_gains = self.lead.edge_gains
+        self._share_nets(net, adopt)
+        self.sessions.append(net)
+        self._stack()
+        return len(self.sessions) - 1
+
+    def _share_nets(self, net, adopt=False):
+        # Sessions made here take the lead's nets; a caller's session keeps its own weights,
+        # so it may only join when they already equal the lead's
+        self._check(net)
+        if not adopt and net.nets is not self.lead.nets:
+            ours, theirs = self.lead.nets.export_weights(), net.nets.export_weights()
+            if any(not np.array_equal(ours[k], theirs[k]) for k in ours):
+                raise ValueError("session net weights differ from the batch lead's")
+        net.nets = self.lead.nets
+
+    def _check(self, net):
+        # The batch path runs the lead's nets and propagation params over every session inline,
+        # so a session must not differ in them or propagate on its own (ticker / push mode)
+        lead = self.lead
+        if net.dim != lead.dim:
+            raise ValueError(f"session dim {net.dim} != batch dim {lead.dim}")
+        if net.dtype != lead.dtype:
+            raise ValueError(f"session precision {net.precision} != batch precision {lead.precision}")
+        if (net.damping, net.co_act_thresh) != (lead.damping, lead.co_act_thresh):
+            raise ValueError(f"session damping/co_act_thresh ({net.damping}, {net.co_act_thresh}) != batch "
+                             f"({lead.damping}, {lead.co_act_thresh})")
+        if not np.array_equal(net.edge_gains, lead.edge_gains):
+            raise ValueError(f"session edge gains {net.edge_gains.tolist()} != batch {lead.edge_gains.tolist()}")
+        if net._ticker is not None:
+            raise ValueError("session has a running ticker; stop_ticker() before batching it")
+        if net.push_eps is not None or net.relax_iters is not None:
+            raise ValueError("session is in push or relax mode; batched propagation is full-step only")
+
+    def _locked(self, sessions):
+        # Hold every session's lock for a batch tick, so single-session calls never interleave
+        stack = contextlib.ExitStack()
+        for net in sessions:
+            stack.enter_context(net._lock)
+        return stack
+
+    def _stack(self):
+        # Pad every session to the widest slot capacity and rebind its arrays as row views
+        cap = max(len(net.vals) for net in self.sessions)
+        b = len(self.sessions)
+        self.cap = cap
+        self.vecs = np.zeros((b, cap, self.lead.dim), dtype=self.lead.dtype)
+        self.vals = np.zeros((b, cap), dtype=self.lead.dtype)
+        self.inactive = np.zeros((b, cap), dtype=np.int32)
+        self.alive = np.zeros((b, cap), dtype=bool)
+        for i, net in enumerate(self.sessions):
+            net._materialize()
+            n = len(net.vals)
+            for name in ('vecs', 'vals', 'inactive', 'alive'):
+                batch = getattr(self, name)
+                batch[i, :n] = getattr(net, name)
+                setattr(net, name, batch[i, :n])
+
+    def process_batch(self, texts):
+        # texts[i] feeds session i; None skips it this tick (no propagation, like no call)
+        if len(texts) != len(self.sessions):
+            raise ValueError(f"expected {len(self.sessions)} texts, got {len(texts)}")
+        with self._locked(self.sessions):
+            for net in self.sessions:
+                self._check(net)  # Params, ticker or push mode may have changed since add_session
+            self._process_batch(texts)
+
+    def _process_batch(self, texts):
+        stepped = np.zeros(len(self.sessions), dtype=bool)
+        jobs = []
+        for i, (net, text) in enumerate(zip(self.sessions, texts)):
+            if text is None:
+                continue
+            text_lower = text.lower()
+            matches = net._match(text_lower)
+            if not matches:
+                net._fracture()
+                continue
+            weights, avg_vec, concat = net._blend_inputs(matches)
+            jobs.append((i, matches, weights, avg_vec, concat, text_lower))
+            stepped[i] = True
+
+        co_acts = {}
+        if jobs:
+            blend_vecs = self.lead.nets.blend(np.stack([job[4] for job in jobs]))
+            xs = []
+            for (i, matches, weights, avg_vec, _, text_lower), blend_vec in zip(jobs, blend_vecs):
+                net = self.sessions[i]
+                co_acts[i] = net._apply_blend(matches, weights, blend_vec, _has_event(text_lower))
+                xs.append(avg_vec.astype(np.float32))
+            # One LSTM step for every stepped session, each from its own carried state
+            steps = [self.sessions[job[0]] for job in jobs]
+            h, c = self.lead.nets.lstm_step(np.stack(xs), np.stack([net.lstm_h for net in steps]),
+                                            np.stack([net.lstm_c for net in steps]))
+            for row, net in enumerate(steps):
+                net._apply_temporal(h[row], c[row])
+            for i, matches, *_ in jobs:
+                self.sessions[i]._push_history(matches)
+
+        self.propagate_tension(stepped)
+        for i, co_act in co_acts.items():
+            self.sessions[i]._resonance(co_act)
+
+    def propagate_tension(self, mask=None):
+        # One GAT pass over the disjoint union of the selected sessions' lattices
+        mask = np.ones(len(self.sessions), dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        if not mask.any():
+            return
+        with self._locked([self.sessions[i] for i in np.flatnonzero(mask)]):
+            self._propagate(mask)
+
+    def _propagate(self, mask):
+        src, dst, w, etype = [], [], [], []
+        for i in np.flatnonzero(mask):
+            net = self.sessions[i]
+            src.append(net.e_src[:net.n_edges] + i * self.cap)
+            dst.append(net.e_dst[:net.n_edges] + i * self.cap)
+            w.append(net.e_w[:net.n_edges])
+            etype.append(net.e_type[:net.n_edges])
+        b = len(self.sessions)
+        live = (self.alive & mask[:, None]).reshape(-1)
+        self.lead._tension_step(self.vecs.reshape(b * self.cap, -1), self.vals.reshape(-1),
+                                self.inactive.reshape(-1), live, np.concatenate(src), np.concatenate(dst),
+                                np.concatenate(w), np.concatenate(etype))
+        for i in np.flatnonzero(mask):
+            self.sessions[i]._unit_stale = True
+            self.sessions[i]._heap_stale = True
+            self.sessions[i]._field_stale = True
+
+    def get_roleplay_emotions(self, character_types, texts):
+        self.process_batch(texts)
+        out = []
+        for net, character_type, text in zip(self.sessions, character_types, texts):
+            if text is None:
+                out.append(None)
+                continue
+            net.turn += 1
+            out.append(net.route_emotion_to_character(character_type, text))
+        return out